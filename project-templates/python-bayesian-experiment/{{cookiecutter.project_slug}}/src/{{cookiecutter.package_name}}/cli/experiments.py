@@ -1,9 +1,10 @@
 """CLI commands for managing experiments."""
 
-import json
+from functools import lru_cache
 
 import click
 import httpx
+import orjson
 
 
 def get_api_url() -> str:
@@ -13,6 +14,17 @@ def get_api_url() -> str:
     return os.getenv("API_URL", "http://localhost:8000")
 
 
+@lru_cache(maxsize=1)
+def get_client() -> httpx.Client:
+    """Get a shared HTTP client so repeated requests reuse pooled connections."""
+    return httpx.Client(base_url=get_api_url(), timeout=30)
+
+
+def format_json(obj) -> str:
+    """Pretty-print an object as JSON."""
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+
+
 @click.group("experiments")
 def experiments_cli():
     """Create, list, and manage experiments."""
@@ -23,13 +35,13 @@ def experiments_cli():
 def list_experiments():
     """List all experiments."""
     try:
-        response = httpx.get(f"{get_api_url()}/experiments")
+        response = get_client().get("/experiments")
         response.raise_for_status()
-        click.echo(json.dumps(response.json(), indent=2))
+        click.echo(format_json(orjson.loads(response.content)))
     except httpx.HTTPStatusError as e:
-        click.echo(json.dumps({"error": str(e)}, indent=2), err=True)
+        click.echo(format_json({"error": str(e)}), err=True)
     except httpx.RequestError as e:
-        click.echo(json.dumps({"error": f"Connection failed: {e}"}, indent=2), err=True)
+        click.echo(format_json({"error": f"Connection failed: {e}"}), err=True)
 
 
 @experiments_cli.command("create")
@@ -39,20 +51,20 @@ def list_experiments():
 def create_experiment(name: str, exp_type: str, description: str):
     """Create a new experiment."""
     try:
-        response = httpx.post(
-            f"{get_api_url()}/experiments",
+        response = get_client().post(
+            "/experiments",
             json={"name": name, "type": exp_type, "description": description},
         )
         response.raise_for_status()
-        click.echo(json.dumps(response.json(), indent=2))
+        click.echo(format_json(orjson.loads(response.content)))
     except httpx.HTTPStatusError as e:
         try:
-            error = e.response.json()
-        except json.JSONDecodeError:
+            error = orjson.loads(e.response.content)
+        except orjson.JSONDecodeError:
             error = {"error": e.response.text}
-        click.echo(json.dumps(error, indent=2), err=True)
+        click.echo(format_json(error), err=True)
     except httpx.RequestError as e:
-        click.echo(json.dumps({"error": f"Connection failed: {e}"}, indent=2), err=True)
+        click.echo(format_json({"error": f"Connection failed: {e}"}), err=True)
 
 
 @experiments_cli.command("delete")
@@ -60,39 +72,53 @@ def create_experiment(name: str, exp_type: str, description: str):
 def delete_experiment(name: str):
     """Delete an experiment."""
     try:
-        response = httpx.delete(f"{get_api_url()}/experiments/{name}")
+        response = get_client().delete(f"/experiments/{name}")
         response.raise_for_status()
-        click.echo(json.dumps({"status": "deleted", "name": name}, indent=2))
+        click.echo(format_json({"status": "deleted", "name": name}))
     except httpx.HTTPStatusError as e:
         try:
-            error = e.response.json()
-        except json.JSONDecodeError:
+            error = orjson.loads(e.response.content)
+        except orjson.JSONDecodeError:
             error = {"error": e.response.text}
-        click.echo(json.dumps(error, indent=2), err=True)
+        click.echo(format_json(error), err=True)
     except httpx.RequestError as e:
-        click.echo(json.dumps({"error": f"Connection failed: {e}"}, indent=2), err=True)
+        click.echo(format_json({"error": f"Connection failed: {e}"}), err=True)
 
 
 @experiments_cli.command("add-data")
 @click.option("--name", required=True, help="Name of the experiment.")
-@click.option("--file", "data_file", type=click.File("r"), default="-", help="JSON data file.")
-def add_data(name: str, data_file):
+@click.option(
+    "--file",
+    "data_files",
+    type=click.File("rb"),
+    multiple=True,
+    default=["-"],
+    help="JSON data file. Repeat to upload several files over one connection.",
+)
+def add_data(name: str, data_files):
     """Add data to an experiment."""
     try:
-        data = json.load(data_file)
-        response = httpx.post(f"{get_api_url()}/experiments/{name}/data", json=data)
-        response.raise_for_status()
-        click.echo(json.dumps(response.json(), indent=2))
-    except json.JSONDecodeError as e:
-        click.echo(json.dumps({"error": f"Invalid JSON: {e}"}, indent=2), err=True)
+        for data_file in data_files:
+            # Validate locally, then send the original bytes rather than re-encoding
+            body = data_file.read()
+            orjson.loads(body)
+            response = get_client().post(
+                f"/experiments/{name}/data",
+                content=body,
+                headers={"content-type": "application/json"},
+            )
+            response.raise_for_status()
+        click.echo(format_json(orjson.loads(response.content)))
+    except orjson.JSONDecodeError as e:
+        click.echo(format_json({"error": f"Invalid JSON: {e}"}), err=True)
     except httpx.HTTPStatusError as e:
         try:
-            error = e.response.json()
-        except json.JSONDecodeError:
+            error = orjson.loads(e.response.content)
+        except orjson.JSONDecodeError:
             error = {"error": e.response.text}
-        click.echo(json.dumps(error, indent=2), err=True)
+        click.echo(format_json(error), err=True)
     except httpx.RequestError as e:
-        click.echo(json.dumps({"error": f"Connection failed: {e}"}, indent=2), err=True)
+        click.echo(format_json({"error": f"Connection failed: {e}"}), err=True)
 
 
 @experiments_cli.command("posterior")
@@ -100,14 +126,14 @@ def add_data(name: str, data_file):
 def get_posterior(name: str):
     """Get posterior summary for an experiment."""
     try:
-        response = httpx.get(f"{get_api_url()}/experiments/{name}/posterior")
+        response = get_client().get(f"/experiments/{name}/posterior")
         response.raise_for_status()
-        click.echo(json.dumps(response.json(), indent=2))
+        click.echo(format_json(orjson.loads(response.content)))
     except httpx.HTTPStatusError as e:
         try:
-            error = e.response.json()
-        except json.JSONDecodeError:
+            error = orjson.loads(e.response.content)
+        except orjson.JSONDecodeError:
             error = {"error": e.response.text}
-        click.echo(json.dumps(error, indent=2), err=True)
+        click.echo(format_json(error), err=True)
     except httpx.RequestError as e:
-        click.echo(json.dumps({"error": f"Connection failed: {e}"}, indent=2), err=True)
+        click.echo(format_json({"error": f"Connection failed: {e}"}), err=True)
@@ -1,5 +1,9 @@
 """Database package."""
 
-from {{cookiecutter.package_name}}.db.store import ExperimentStore
+from {{cookiecutter.package_name}}.db.store import (
+    ExperimentColumns,
+    ExperimentRecord,
+    ExperimentStore,
+)
 
-__all__ = ["ExperimentStore"]
+__all__ = ["ExperimentColumns", "ExperimentRecord", "ExperimentStore"]
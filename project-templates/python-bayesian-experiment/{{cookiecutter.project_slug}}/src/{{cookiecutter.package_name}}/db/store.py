@@ -4,9 +4,120 @@ For production use, replace with a proper database backend
 (e.g., DuckDB via Ibis, PostgreSQL, etc.)
 """
 
+import itertools
+import threading
+from dataclasses import dataclass, field
 from typing import Optional
 
-from {{cookiecutter.package_name}}.schemas import Experiment
+import numpy as np
+
+from {{cookiecutter.package_name}}.schemas import (
+    DataPoint,
+    DataPointStruct,
+    Experiment,
+    PosteriorSummary,
+    VariantPosteriors,
+)
+
+# Source of ExperimentColumns versions; unique across all experiments, so a
+# deleted and recreated experiment never reuses a version
+_versions = itertools.count()
+
+
+def _empty(dtype) -> np.ndarray:
+    return np.empty(0, dtype=dtype)
+
+
+@dataclass(frozen=True, eq=False)
+class ExperimentColumns:
+    """Immutable snapshot of an experiment's data points, one array per field.
+
+    All arrays have the same length. Read `ExperimentRecord.columns` once and
+    use that snapshot throughout, so a concurrent `add_data` can never pair
+    new outcomes with old variants.
+    """
+
+    timestamps: np.ndarray = field(default_factory=lambda: _empty(object))
+    variants: np.ndarray = field(default_factory=lambda: _empty(object))
+    outcomes: np.ndarray = field(default_factory=lambda: _empty(bool))
+    # NaN where a data point has no value
+    values: np.ndarray = field(default_factory=lambda: _empty(float))
+    # Changes whenever data is added; identifies what a cached posterior saw
+    version: int = field(default_factory=lambda: next(_versions))
+
+
+@dataclass(eq=False)
+class ExperimentRecord:
+    """Column-oriented internal representation of an experiment.
+
+    Data points are held as parallel numpy arrays, one per field, instead of a
+    list of Pydantic models, so model code can use e.g. `columns.outcomes`
+    directly. Convert with `to_schema` at the API boundary.
+    """
+
+    name: str
+    type: str
+    description: str = ""
+    columns: ExperimentColumns = field(default_factory=ExperimentColumns)
+    # Serializes writers; readers use the published `columns` snapshot unlocked
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def add_data(self, data: list[DataPoint] | list[DataPointStruct]) -> None:
+        """Append data points, publishing all new columns in a single assignment."""
+        with self._lock:
+            self._append(data)
+
+    def _append(self, data: list[DataPoint] | list[DataPointStruct]) -> None:
+        n = len(data)
+        old = self.columns
+        self.columns = ExperimentColumns(
+            timestamps=np.concatenate(
+                [old.timestamps, np.fromiter((d.timestamp for d in data), dtype=object, count=n)]
+            ),
+            variants=np.concatenate(
+                [old.variants, np.fromiter((d.variant for d in data), dtype=object, count=n)]
+            ),
+            outcomes=np.concatenate(
+                [old.outcomes, np.fromiter((d.outcome for d in data), dtype=bool, count=n)]
+            ),
+            values=np.concatenate(
+                [
+                    old.values,
+                    np.fromiter(
+                        (np.nan if d.value is None else d.value for d in data),
+                        dtype=float,
+                        count=n,
+                    ),
+                ]
+            ),
+        )
+
+    def to_schema(self) -> Experiment:
+        """Convert to the API schema.
+
+        This builds one `DataPoint` per stored row, so it is O(rows) per call;
+        the column layout speeds up model code, not full-data responses.
+        """
+        columns = self.columns
+        return Experiment(
+            name=self.name,
+            type=self.type,
+            description=self.description,
+            data=[
+                DataPoint(
+                    timestamp=timestamp,
+                    variant=variant,
+                    outcome=outcome,
+                    value=None if np.isnan(value) else value,
+                )
+                for timestamp, variant, outcome, value in zip(
+                    columns.timestamps.tolist(),
+                    columns.variants.tolist(),
+                    columns.outcomes.tolist(),
+                    columns.values.tolist(),
+                )
+            ],
+        )
 
 
 class ExperimentStore:
@@ -20,23 +131,63 @@ class ExperimentStore:
     """
 
     def __init__(self):
-        self._experiments: dict[str, Experiment] = {}
+        self._experiments: dict[str, ExperimentRecord] = {}
+        # (name, variant) -> (data version the posterior was computed from, posterior)
+        self._posterior_cache: dict[
+            tuple[str, Optional[str]], tuple[int, PosteriorSummary | VariantPosteriors]
+        ] = {}
 
-    def list_experiments(self) -> list[Experiment]:
+    def list_experiments(self) -> list[ExperimentRecord]:
         """List all experiments."""
         return list(self._experiments.values())
 
-    def get_experiment(self, name: str) -> Optional[Experiment]:
+    def get_experiment(self, name: str) -> Optional[ExperimentRecord]:
         """Get an experiment by name."""
         return self._experiments.get(name)
 
-    def save_experiment(self, experiment: Experiment) -> None:
+    def save_experiment(self, experiment: ExperimentRecord) -> None:
         """Save or update an experiment."""
         self._experiments[experiment.name] = experiment
+        self._invalidate_posteriors(experiment.name)
 
     def delete_experiment(self, name: str) -> bool:
         """Delete an experiment. Returns True if deleted, False if not found."""
         if name in self._experiments:
             del self._experiments[name]
+            self._invalidate_posteriors(name)
             return True
         return False
+
+    def get_cached_posterior(
+        self, name: str, variant: Optional[str], version: int
+    ) -> Optional[PosteriorSummary | VariantPosteriors]:
+        """Get a previously computed posterior, if it was computed from `version` of the data."""
+        cached = self._posterior_cache.get((name, variant))
+        if cached is None or cached[0] != version:
+            return None
+        return cached[1]
+
+    def set_cached_posterior(
+        self,
+        name: str,
+        variant: Optional[str],
+        version: int,
+        summary: PosteriorSummary | VariantPosteriors,
+    ) -> None:
+        """Cache a posterior computed from `version` of the experiment's data.
+
+        Skipped if data was added while the posterior was being computed; the
+        version check in `get_cached_posterior` keeps any late write harmless.
+        """
+        experiment = self._experiments.get(name)
+        if experiment is None or experiment.columns.version != version:
+            return
+        self._posterior_cache[(name, variant)] = (version, summary)
+
+    def _invalidate_posteriors(self, name: str) -> None:
+        """Drop cached posteriors (for every variant) of an experiment."""
+        # list() snapshots the keys atomically; posteriors may be cached from
+        # threadpool workers while this runs
+        for key in list(self._posterior_cache):
+            if key[0] == name:
+                self._posterior_cache.pop(key, None)
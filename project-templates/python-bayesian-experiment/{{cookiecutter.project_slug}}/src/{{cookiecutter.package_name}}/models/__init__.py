@@ -1,5 +1,9 @@
 """PyMC models package."""
 
-from {{cookiecutter.package_name}}.models.bernoulli import fit_bernoulli_model
+from {{cookiecutter.package_name}}.models.bernoulli import (
+    beta_posterior_params,
+    fit_bernoulli_model,
+    sample_variant_posteriors,
+)
 
-__all__ = ["fit_bernoulli_model"]
+__all__ = ["beta_posterior_params", "fit_bernoulli_model", "sample_variant_posteriors"]
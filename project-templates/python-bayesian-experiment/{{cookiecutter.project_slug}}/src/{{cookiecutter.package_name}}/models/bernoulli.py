@@ -1,14 +1,93 @@
-"""PyMC models for Bernoulli experiments."""
+"""Bayesian models for Bernoulli experiments."""
+
+from typing import Optional
 
 import arviz as az
 import numpy as np
-import pymc as pm
+from scipy import stats
+
+# Beta(1, 1) prior on p, i.e. uniform on [0, 1]
+PRIOR_ALPHA = 1.0
+PRIOR_BETA = 1.0
+
+
+def beta_posterior_params(data: np.ndarray) -> tuple[float, float]:
+    """
+    Closed-form posterior parameters for the Beta-Bernoulli model.
+
+    The Beta prior is conjugate to the Bernoulli likelihood, so the posterior
+    over p is Beta(alpha + k, beta + n - k) where k is the number of successes
+    in n trials. No sampling is needed.
+
+    Parameters
+    ----------
+    data : np.ndarray
+        Array of Bernoulli trials (0s and 1s, or booleans).
+
+    Returns
+    -------
+    tuple[float, float]
+        The (alpha, beta) parameters of the posterior Beta distribution.
+    """
+    k = int(np.count_nonzero(data))
+    n = len(data)
+    return PRIOR_ALPHA + k, PRIOR_BETA + n - k
+
 
+def sample_variant_posteriors(
+    outcomes: np.ndarray,
+    variant_codes: np.ndarray,
+    n_variants: int,
+    draws: int = 2000,
+    random_seed: Optional[int] = None,
+) -> np.ndarray:
+    """
+    Sample the posterior of p for every variant of an experiment at once.
+
+    Per-variant successes and trials are counted with `np.bincount`, and all
+    conjugate Beta posteriors are sampled in a single vectorized call.
+
+    Parameters
+    ----------
+    outcomes : np.ndarray
+        Array of Bernoulli trials (0s and 1s, or booleans).
+    variant_codes : np.ndarray
+        Integer variant index in [0, n_variants) for each trial.
+    n_variants : int
+        Number of variants.
+    draws : int
+        Number of posterior samples per variant.
+    random_seed : int, optional
+        Seed for the random number generator.
 
-def fit_bernoulli_model(data: np.ndarray, draws: int = 1000, chains: int = 2) -> az.InferenceData:
+    Returns
+    -------
+    np.ndarray
+        Array of shape (draws, n_variants); column i holds samples for variant i.
+    """
+    successes = np.bincount(variant_codes, weights=outcomes, minlength=n_variants)
+    trials = np.bincount(variant_codes, minlength=n_variants)
+    return stats.beta.rvs(
+        PRIOR_ALPHA + successes,
+        PRIOR_BETA + trials - successes,
+        size=(draws, n_variants),
+        random_state=random_seed,
+    )
+
+
+def fit_bernoulli_model(
+    data: np.ndarray,
+    draws: int = 1000,
+    chains: int = 2,
+    random_seed: Optional[int] = None,
+) -> az.InferenceData:
     """
     Fit a Bayesian Bernoulli model to estimate the success probability.
 
+    With a conjugate Beta prior the posterior is known exactly (see
+    `beta_posterior_params`), so samples are drawn directly from it rather
+    than via MCMC. The result has the same shape as `pm.sample` output.
+
     Parameters
     ----------
     data : np.ndarray
@@ -16,7 +95,9 @@ def fit_bernoulli_model(data: np.ndarray, draws: int = 1000, chains: int = 2) ->
     draws : int
         Number of posterior samples per chain.
     chains : int
-        Number of MCMC chains.
+        Number of chains (kept for parity with MCMC-fitted models).
+    random_seed : int, optional
+        Seed for the random number generator.
 
     Returns
     -------
@@ -31,14 +112,6 @@ def fit_bernoulli_model(data: np.ndarray, draws: int = 1000, chains: int = 2) ->
     >>> p_samples = idata.posterior["p"].values.flatten()
     >>> print(f"Estimated p: {p_samples.mean():.3f} ± {p_samples.std():.3f}")
     """
-    with pm.Model():
-        # Prior: Beta(1, 1) is uniform on [0, 1]
-        p = pm.Beta("p", alpha=1.0, beta=1.0)
-
-        # Likelihood
-        pm.Bernoulli("likelihood", p=p, observed=data)
-
-        # Sample from posterior
-        idata = pm.sample(draws=draws, chains=chains, progressbar=False)
-
-    return idata
+    alpha, beta = beta_posterior_params(data)
+    samples = stats.beta.rvs(alpha, beta, size=(chains, draws), random_state=random_seed)
+    return az.from_dict(posterior={"p": samples})
@@ -2,6 +2,7 @@
 
 from typing import Literal, Optional
 
+import msgspec
 from pydantic import BaseModel
 
 
@@ -14,6 +15,19 @@ class DataPoint(BaseModel):
     value: Optional[float] = None
 
 
+class DataPointStruct(msgspec.Struct, kw_only=True):
+    """msgspec mirror of `DataPoint` for decoding large request bodies.
+
+    Validation happens in C, which is much faster than Pydantic for long
+    lists of data points. `DataPoint` remains the documented API schema.
+    """
+
+    timestamp: str
+    variant: str = "control"
+    outcome: bool
+    value: Optional[float] = None
+
+
 class CreateExperimentRequest(BaseModel):
     """Request to create a new experiment."""
 
@@ -47,3 +61,9 @@ class PosteriorSummary(BaseModel):
     hdi_low: float
     hdi_high: float
     curve: PosteriorCurve
+
+
+class VariantPosteriors(BaseModel):
+    """Posterior summaries for each variant of an A/B test."""
+
+    variants: dict[str, PosteriorSummary]
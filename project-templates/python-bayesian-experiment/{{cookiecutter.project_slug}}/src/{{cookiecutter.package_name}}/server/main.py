@@ -76,8 +76,8 @@ app = FastAPI(
 # Include routers
 app.include_router(experiments.router)
 
-# Prometheus metrics
-Instrumentator().instrument(app).expose(app)
+# Prometheus metrics (probe and scrape traffic is not instrumented)
+Instrumentator(excluded_handlers=["/healthz", "/metrics"]).instrument(app).expose(app)
 
 
 @app.get("/healthz", tags=["health"])
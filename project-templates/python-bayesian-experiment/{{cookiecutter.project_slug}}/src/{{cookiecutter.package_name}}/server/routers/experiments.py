@@ -1,19 +1,27 @@
 """Experiments router for managing Bayesian experiments."""
 
+from functools import lru_cache
 from typing import Optional
 
+import msgspec
 import numpy as np
-from fastapi import APIRouter, HTTPException
-from scipy import stats
-
-from {{cookiecutter.package_name}}.db.store import ExperimentStore
-from {{cookiecutter.package_name}}.models.bernoulli import fit_bernoulli_model
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.exceptions import RequestValidationError
+from scipy import signal, stats
+
+from {{cookiecutter.package_name}}.db.store import ExperimentRecord, ExperimentStore
+from {{cookiecutter.package_name}}.models.bernoulli import (
+    beta_posterior_params,
+    sample_variant_posteriors,
+)
 from {{cookiecutter.package_name}}.schemas import (
     CreateExperimentRequest,
-    DataPoint,
+    DataPointStruct,
     Experiment,
     PosteriorCurve,
     PosteriorSummary,
+    VariantPosteriors,
 )
 
 router = APIRouter(prefix="/experiments", tags=["experiments"])
@@ -21,11 +29,107 @@ router = APIRouter(prefix="/experiments", tags=["experiments"])
 # In-memory store (replace with database in production)
 store = ExperimentStore()
 
+# Request bodies for POST /{name}/data are decoded with msgspec rather than
+# validated through Pydantic; the schema below keeps the OpenAPI docs intact.
+# Lax mode accepts the coercions clients relied on with Pydantic, such as
+# `"outcome": 1` or `"outcome": "true"`.
+_data_points_decoder = msgspec.json.Decoder(list[DataPointStruct], strict=False)
+_DATA_POINTS_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/json": {
+                "schema": {"type": "array", "items": {"$ref": "#/components/schemas/DataPoint"}}
+            }
+        },
+    }
+}
+
+# Number of posterior samples drawn per request
+POSTERIOR_DRAWS = 2000
+
+# Grid resolution for the FFT-based posterior density estimate
+KDE_BINS = 1024
+
+
+@lru_cache(maxsize=64)
+def _gaussian_kernel(sigma: float) -> np.ndarray:
+    """Normalized Gaussian kernel with standard deviation `sigma` (in grid bins)."""
+    half_width = int(np.ceil(4 * sigma))
+    t = np.arange(-half_width, half_width + 1)
+    kernel = np.exp(-0.5 * (t / sigma) ** 2)
+    return kernel / kernel.sum()
+
+
+def _fft_kde(samples: np.ndarray, x: np.ndarray) -> np.ndarray:
+    """Evaluate a Gaussian KDE of `samples` at `x`.
+
+    Bins the samples onto a regular grid and convolves with a Gaussian kernel
+    via FFT, which is O(M log M) in the grid size rather than O(N * M) like
+    `scipy.stats.gaussian_kde`. Uses the same Scott's-rule bandwidth.
+    """
+    bandwidth = samples.std(ddof=1) * samples.size ** (-1 / 5)
+    lo, hi = samples.min() - 4 * bandwidth, samples.max() + 4 * bandwidth
+    density, edges = np.histogram(samples, bins=KDE_BINS, range=(lo, hi), density=True)
+    # Rounded so the cached kernel is reused across similar posteriors
+    sigma = round(bandwidth / (edges[1] - edges[0]), 1)
+    smoothed = signal.fftconvolve(density, _gaussian_kernel(sigma), mode="same")
+    centers = (edges[:-1] + edges[1:]) / 2
+    return np.interp(x, centers, smoothed, left=0.0, right=0.0)
+
+
+def _summarize(samples: np.ndarray) -> PosteriorSummary:
+    """Summarize posterior samples of p, including a density curve for plotting."""
+    x = np.linspace(0, 1, 200)
+    y = _fft_kde(samples, x)
+
+    # Both interval endpoints from a single partition of the samples
+    hdi_low, hdi_high = np.quantile(samples, [0.03, 0.97])
+
+    return PosteriorSummary(
+        parameter="p",
+        mean=float(samples.mean()),
+        std=float(samples.std()),
+        hdi_low=float(hdi_low),
+        hdi_high=float(hdi_high),
+        curve=PosteriorCurve(x=x.tolist(), y=y.tolist()),
+    )
+
+
+def _append_data(experiment: ExperimentRecord, body: bytes) -> Experiment:
+    """Decode and append a batch of data points.
+
+    O(rows) CPU work, so `add_data` runs this in the threadpool rather than on
+    the event loop. Errors are raised in FastAPI's usual 422 format.
+    """
+    try:
+        data = _data_points_decoder.decode(body)
+    except msgspec.ValidationError as e:
+        raise RequestValidationError(
+            [{"type": "value_error", "loc": ("body",), "msg": str(e), "input": None}]
+        )
+    except msgspec.DecodeError as e:
+        raise RequestValidationError(
+            [
+                {
+                    "type": "json_invalid",
+                    "loc": ("body",),
+                    "msg": "JSON decode error",
+                    "input": {},
+                    "ctx": {"error": str(e)},
+                }
+            ]
+        )
+
+    experiment.add_data(data)
+    store.save_experiment(experiment)
+    return experiment.to_schema()
+
 
 @router.get("", response_model=list[Experiment])
 def list_experiments():
     """List all experiments."""
-    return store.list_experiments()
+    return [experiment.to_schema() for experiment in store.list_experiments()]
 
 
 @router.post("", response_model=Experiment)
@@ -34,14 +138,13 @@ def create_experiment(request: CreateExperimentRequest):
     if store.get_experiment(request.name):
         raise HTTPException(status_code=400, detail=f"Experiment '{request.name}' already exists")
 
-    experiment = Experiment(
+    experiment = ExperimentRecord(
         name=request.name,
         type=request.type,
         description=request.description,
-        data=[],
     )
     store.save_experiment(experiment)
-    return experiment
+    return experiment.to_schema()
 
 
 @router.get("/{name}", response_model=Experiment)
@@ -50,7 +153,7 @@ def get_experiment(name: str):
     experiment = store.get_experiment(name)
     if not experiment:
         raise HTTPException(status_code=404, detail=f"Experiment '{name}' not found")
-    return experiment
+    return experiment.to_schema()
 
 
 @router.delete("/{name}")
@@ -62,57 +165,64 @@ def delete_experiment(name: str):
     return {"status": "deleted", "name": name}
 
 
-@router.post("/{name}/data", response_model=Experiment)
-def add_data(name: str, data: list[DataPoint]):
+@router.post("/{name}/data", response_model=Experiment, openapi_extra=_DATA_POINTS_BODY)
+async def add_data(name: str, request: Request):
     """Add data points to an experiment."""
     experiment = store.get_experiment(name)
     if not experiment:
         raise HTTPException(status_code=404, detail=f"Experiment '{name}' not found")
 
-    experiment.data.extend(data)
-    store.save_experiment(experiment)
-    return experiment
+    return await run_in_threadpool(_append_data, experiment, await request.body())
 
 
-@router.get("/{name}/posterior", response_model=PosteriorSummary)
+@router.get("/{name}/posterior", response_model=PosteriorSummary | VariantPosteriors)
 def get_posterior(name: str, variant: Optional[str] = None):
     """Compute posterior distribution for an experiment."""
     experiment = store.get_experiment(name)
     if not experiment:
         raise HTTPException(status_code=404, detail=f"Experiment '{name}' not found")
 
-    if not experiment.data:
+    # One consistent snapshot of the data, even if more is added meanwhile
+    columns = experiment.columns
+
+    # Reuse the last result if it was computed from this same data
+    cached = store.get_cached_posterior(name, variant, columns.version)
+    if cached is not None:
+        return cached
+
+    if not columns.outcomes.size:
         raise HTTPException(status_code=400, detail="No data available for this experiment")
 
     # Filter by variant if specified
-    data = experiment.data
+    outcomes = columns.outcomes
+    variants = columns.variants
     if variant:
-        data = [d for d in data if d.variant == variant]
+        mask = variants == variant
+        outcomes, variants = outcomes[mask], variants[mask]
 
-    if not data:
+    if not outcomes.size:
         raise HTTPException(status_code=400, detail=f"No data for variant '{variant}'")
 
-    # Extract outcomes (0/1 for Bernoulli)
-    outcomes = np.array([1 if d.outcome else 0 for d in data])
-
     if experiment.type == "bernoulli":
-        idata = fit_bernoulli_model(outcomes)
-        posterior_samples = idata.posterior["p"].values.flatten()
-
-        # Generate KDE curve
-        kde = stats.gaussian_kde(posterior_samples)
-        x = np.linspace(0, 1, 200)
-        y = kde(x)
-
-        return PosteriorSummary(
-            parameter="p",
-            mean=float(posterior_samples.mean()),
-            std=float(posterior_samples.std()),
-            hdi_low=float(np.percentile(posterior_samples, 3)),
-            hdi_high=float(np.percentile(posterior_samples, 97)),
-            curve=PosteriorCurve(x=x.tolist(), y=y.tolist()),
+        # Conjugate model: sample the exact Beta posterior instead of running MCMC
+        alpha, beta = beta_posterior_params(outcomes)
+        posterior_samples = stats.beta.rvs(alpha, beta, size=POSTERIOR_DRAWS, random_state=0)
+        summary = _summarize(posterior_samples)
+    elif experiment.type == "ab_test":
+        # One vectorized draw covers every variant's posterior
+        names, codes = np.unique(variants, return_inverse=True)
+        posterior_samples = sample_variant_posteriors(
+            outcomes, codes, len(names), draws=POSTERIOR_DRAWS, random_seed=0
+        )
+        summary = VariantPosteriors(
+            variants={
+                name: _summarize(posterior_samples[:, i]) for i, name in enumerate(names.tolist())
+            }
         )
     else:
         raise HTTPException(
             status_code=400, detail=f"Posterior not implemented for type '{experiment.type}'"
         )
+
+    store.set_cached_posterior(name, variant, columns.version, summary)
+    return summary
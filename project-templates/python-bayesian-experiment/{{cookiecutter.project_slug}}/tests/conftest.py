@@ -0,0 +1,12 @@
+"""Shared pytest fixtures."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture(scope="session")
+def client() -> TestClient:
+    """One TestClient for the whole session, so the app is wired up only once."""
+    from {{cookiecutter.package_name}}.server.main import app
+
+    return TestClient(app)
@@ -1,27 +1,23 @@
 """Tests for the FastAPI server."""
 
-from fastapi.testclient import TestClient
+import pytest
 
-from {{cookiecutter.package_name}}.server.main import app
 
-client = TestClient(app)
-
-
-def test_healthz():
+def test_healthz(client):
     """Test health check endpoint."""
     response = client.get("/healthz")
     assert response.status_code == 200
     assert response.json() == {"status": "ok"}
 
 
-def test_list_experiments_empty():
+def test_list_experiments_empty(client):
     """Test listing experiments when none exist."""
     response = client.get("/experiments")
     assert response.status_code == 200
     assert response.json() == []
 
 
-def test_create_experiment():
+def test_create_experiment(client):
     """Test creating an experiment."""
     response = client.post(
         "/experiments",
@@ -36,7 +32,7 @@ def test_create_experiment():
     client.delete("/experiments/test-exp")
 
 
-def test_create_duplicate_experiment():
+def test_create_duplicate_experiment(client):
     """Test that creating a duplicate experiment fails."""
     # Create first
     client.post(
@@ -56,7 +52,133 @@ def test_create_duplicate_experiment():
     client.delete("/experiments/dup-exp")
 
 
-def test_get_nonexistent_experiment():
+def test_get_nonexistent_experiment(client):
     """Test getting a nonexistent experiment."""
     response = client.get("/experiments/nonexistent")
     assert response.status_code == 404
+
+
+def test_bernoulli_posterior(client):
+    """Test the posterior summary for a Bernoulli experiment."""
+    client.post("/experiments", json={"name": "posterior-exp", "type": "bernoulli"})
+    data = [{"timestamp": f"2024-01-01T00:00:{i:02d}", "outcome": i % 4 == 0} for i in range(40)]
+    client.post("/experiments/posterior-exp/data", json=data)
+
+    response = client.get("/experiments/posterior-exp/posterior")
+    assert response.status_code == 200
+    summary = response.json()
+    # 10 successes in 40 trials with a Beta(1, 1) prior -> Beta(11, 31), mean 11/42
+    assert summary["mean"] == pytest.approx(11 / 42, abs=0.01)
+    assert summary["hdi_low"] < summary["mean"] < summary["hdi_high"]
+    assert len(summary["curve"]["x"]) == len(summary["curve"]["y"])
+
+    # Cleanup
+    client.delete("/experiments/posterior-exp")
+
+
+def test_posterior_cache_invalidated_by_new_data(client):
+    """Test that adding data refreshes a previously computed posterior."""
+    client.post("/experiments", json={"name": "cache-exp", "type": "bernoulli"})
+    client.post(
+        "/experiments/cache-exp/data",
+        json=[{"timestamp": "2024-01-01T00:00:00", "outcome": False}] * 20,
+    )
+    first = client.get("/experiments/cache-exp/posterior").json()
+    assert client.get("/experiments/cache-exp/posterior").json() == first
+
+    client.post(
+        "/experiments/cache-exp/data",
+        json=[{"timestamp": "2024-01-01T00:01:00", "outcome": True}] * 20,
+    )
+    second = client.get("/experiments/cache-exp/posterior").json()
+    assert second["mean"] > first["mean"]
+
+    # Cleanup
+    client.delete("/experiments/cache-exp")
+
+
+def test_posterior_not_cached_when_data_added_during_compute(client, monkeypatch):
+    """Test that a posterior computed from stale data is not served after a write."""
+    from {{cookiecutter.package_name}}.server.routers import experiments
+
+    client.post("/experiments", json={"name": "race-exp", "type": "bernoulli"})
+    client.post(
+        "/experiments/race-exp/data",
+        json=[{"timestamp": "2024-01-01T00:00:00", "outcome": False}] * 20,
+    )
+
+    # Add data between reading the experiment and storing the computed posterior
+    summarize = experiments._summarize
+
+    def summarize_then_write(samples):
+        summary = summarize(samples)
+        monkeypatch.setattr(experiments, "_summarize", summarize)
+        client.post(
+            "/experiments/race-exp/data",
+            json=[{"timestamp": "2024-01-01T00:01:00", "outcome": True}] * 20,
+        )
+        return summary
+
+    monkeypatch.setattr(experiments, "_summarize", summarize_then_write)
+    stale = client.get("/experiments/race-exp/posterior").json()
+
+    fresh = client.get("/experiments/race-exp/posterior").json()
+    assert fresh["mean"] > stale["mean"]
+
+    # Cleanup
+    client.delete("/experiments/race-exp")
+
+
+def test_add_data_coerces_outcomes(client):
+    """Test that outcomes sent as 0/1 or "true"/"false" are accepted."""
+    client.post("/experiments", json={"name": "coerce-exp", "type": "bernoulli"})
+
+    response = client.post(
+        "/experiments/coerce-exp/data",
+        json=[
+            {"timestamp": "2024-01-01T00:00:00", "outcome": 1},
+            {"timestamp": "2024-01-01T00:00:01", "outcome": "false"},
+        ],
+    )
+    assert response.status_code == 200
+    assert [d["outcome"] for d in response.json()["data"]] == [True, False]
+
+    # Cleanup
+    client.delete("/experiments/coerce-exp")
+
+
+def test_add_invalid_data(client):
+    """Test that malformed data points are rejected."""
+    client.post("/experiments", json={"name": "invalid-data-exp", "type": "bernoulli"})
+
+    response = client.post(
+        "/experiments/invalid-data-exp/data",
+        json=[{"timestamp": "2024-01-01T00:00:00"}],
+    )
+    assert response.status_code == 422
+    assert "outcome" in response.json()["detail"][0]["msg"]
+
+    # Cleanup
+    client.delete("/experiments/invalid-data-exp")
+
+
+def test_ab_test_posterior(client):
+    """Test per-variant posterior summaries for an A/B test."""
+    client.post("/experiments", json={"name": "ab-exp", "type": "ab_test"})
+    data = [
+        {"timestamp": "2024-01-01T00:00:00", "variant": "control", "outcome": i % 5 == 0}
+        for i in range(50)
+    ] + [
+        {"timestamp": "2024-01-01T00:00:00", "variant": "treatment", "outcome": i % 2 == 0}
+        for i in range(50)
+    ]
+    client.post("/experiments/ab-exp/data", json=data)
+
+    response = client.get("/experiments/ab-exp/posterior")
+    assert response.status_code == 200
+    variants = response.json()["variants"]
+    assert set(variants) == {"control", "treatment"}
+    assert variants["treatment"]["mean"] > variants["control"]["mean"]
+
+    # Cleanup
+    client.delete("/experiments/ab-exp")
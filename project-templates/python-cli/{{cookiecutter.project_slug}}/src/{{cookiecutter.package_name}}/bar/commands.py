@@ -24,5 +24,6 @@ def do_other(dry_run: bool) -> None:
 @click.option("--count", "-c", default=1, help="Number of times to greet.")
 def greet(name: str, count: int) -> None:
     """Greet someone multiple times."""
-    for _ in range(count):
-        click.echo(f"Bar: Hello, {name}!")
+    # Format once and emit every line in a single write
+    msg = f"Bar: Hello, {name}!\n"
+    click.echo(msg * count, nl=False)
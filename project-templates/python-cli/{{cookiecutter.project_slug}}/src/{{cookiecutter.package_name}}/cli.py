@@ -2,7 +2,9 @@
 Structured CLI with subcommand modules.
 
 This CLI demonstrates the pattern of organizing subcommands into separate
-modules under the package, then importing and registering them here.
+modules under the package and registering them here. Subcommand modules are
+imported only when their group is invoked, so `hello` and `--version` don't
+pay for them.
 
 Usage:
     {{cookiecutter.project_slug}} --help
@@ -10,15 +12,39 @@ Usage:
     {{cookiecutter.project_slug}} bar do-other
 """
 
-import click
+import importlib
 
-from .bar.commands import cli as bar
-from .foo.commands import cli as foo
+import click
 
 CONTEXT_SETTINGS = {"help_option_names": ["-h", "--help"]}
 
 
-@click.group(context_settings=CONTEXT_SETTINGS)
+class LazyGroup(click.Group):
+    """Click group that imports subcommand groups on first use."""
+
+    def __init__(self, *args, lazy_subcommands: dict[str, str] | None = None, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        # Subcommand name -> module (relative to this package) defining `cli`
+        self.lazy_subcommands = lazy_subcommands or {}
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        return sorted([*super().list_commands(ctx), *self.lazy_subcommands])
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> click.Command | None:
+        if cmd_name in self.lazy_subcommands:
+            module = importlib.import_module(self.lazy_subcommands[cmd_name], __package__)
+            return module.cli
+        return super().get_command(ctx, cmd_name)
+
+
+@click.group(
+    cls=LazyGroup,
+    context_settings=CONTEXT_SETTINGS,
+    lazy_subcommands={
+        "foo": ".foo.commands",
+        "bar": ".bar.commands",
+    },
+)
 @click.version_option()
 def cli() -> None:
     """{{cookiecutter.description}}"""
@@ -32,11 +58,6 @@ def hello(name: str) -> None:
     click.echo(f"Hello, {name}!")
 
 
-# Register subcommand groups from modules
-cli.add_command(foo, name="foo")
-cli.add_command(bar, name="bar")
-
-
 def main() -> None:
     cli()
 
@@ -1,47 +1,80 @@
+import copy
+import hashlib
 import logging
 import os
 import sys
+import threading
+import time
 from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from typing import Dict
 
+import jwt
+import orjson
 import structlog
-from fastapi import Depends, FastAPI, HTTPException, status
+from cachetools import TTLCache
+from fastapi import Depends, FastAPI, HTTPException, Response, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from jose import JWTError, jwt
+from jwt import InvalidTokenError
 from prometheus_fastapi_instrumentator import Instrumentator
 
 
 # -------------------------
-# Logging configuration
+# Configuration
 # -------------------------
-def configure_logging() -> None:
+@dataclass(frozen=True, slots=True)
+class Config:
+    log_level: int
+    json_logs: bool
+    service_name: str
+    jwt_secret: str
+    jwt_alg: str
+
+
+def load_config() -> Config:
     log_level_name = os.getenv("LOG_LEVEL", "WARNING").upper()
-    log_level = getattr(logging, log_level_name, logging.WARNING)
-    json_logs = os.getenv("LOG_JSON", "true").lower() == "true"
-    service_name = os.getenv("SERVICE_NAME", "{{cookiecutter.project_slug}}")
+    return Config(
+        log_level=getattr(logging, log_level_name, logging.WARNING),
+        json_logs=os.getenv("LOG_JSON", "true").lower() == "true",
+        service_name=os.getenv("SERVICE_NAME", "{{cookiecutter.project_slug}}"),
+        jwt_secret=os.getenv("AUTH_SECRET", "change-me"),
+        jwt_alg=os.getenv("JWT_ALG", "HS256"),
+    )
+
 
-    logging.basicConfig(level=log_level, stream=sys.stderr)
+# Environment is read once at import
+CONFIG = load_config()
+
+
+# -------------------------
+# Logging configuration
+# -------------------------
+def configure_logging(config: Config = CONFIG) -> None:
+    logging.basicConfig(level=config.log_level, stream=sys.stderr)
 
     processors = [
         structlog.contextvars.merge_contextvars,
         structlog.processors.add_log_level,
         structlog.processors.TimeStamper(fmt="iso"),
-        structlog.processors.StackInfoRenderer(),
-        structlog.processors.format_exc_info,
     ]
-    if json_logs:
-        processors.append(structlog.processors.JSONRenderer())
+    if config.json_logs:
+        # ConsoleRenderer formats exceptions itself; JSON needs them flattened
+        processors.append(structlog.processors.format_exc_info)
+        # orjson renders bytes; write them as-is instead of decoding to str
+        processors.append(structlog.processors.JSONRenderer(serializer=orjson.dumps))
+        logger_factory = structlog.BytesLoggerFactory()
     else:
         processors.append(structlog.dev.ConsoleRenderer())
+        logger_factory = structlog.PrintLoggerFactory()
 
     structlog.configure(
         processors=processors,
-        wrapper_class=structlog.make_filtering_bound_logger(log_level),
-        logger_factory=structlog.PrintLoggerFactory(),
+        wrapper_class=structlog.make_filtering_bound_logger(config.log_level),
+        logger_factory=logger_factory,
         cache_logger_on_first_use=True,
     )
 
-    structlog.contextvars.bind_contextvars(service=service_name)
+    structlog.contextvars.bind_contextvars(service=config.service_name)
 
 
 configure_logging()
@@ -51,23 +84,62 @@ log = structlog.get_logger()
 # -------------------------
 # Auth configuration
 # -------------------------
-JWT_SECRET = os.getenv("AUTH_SECRET", "change-me")
-JWT_ALG = os.getenv("JWT_ALG", "HS256")
+JWT_SECRET = CONFIG.jwt_secret
+JWT_ALG = CONFIG.jwt_alg
 security = HTTPBearer(auto_error=True)
 
+# Verified claims keyed by sha256(token), so repeat requests with the same
+# token skip signature verification and JSON parsing. Entries live at most
+# 30s and are never served past the token's own `exp`. Callers always get
+# their own copy, so a handler mutating its claims can't affect later requests.
+_CLAIMS_CACHE: TTLCache = TTLCache(maxsize=10_000, ttl=30)
+# TTLCache mutates itself on reads too (expiry), and sync dependencies run in
+# FastAPI's threadpool, so every access goes through this lock.
+_CLAIMS_LOCK = threading.Lock()
+
+
+def _unauthorized() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid or expired token",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
 
 def require_claims(
     credentials: HTTPAuthorizationCredentials = Depends(security),
 ) -> Dict:
     token = credentials.credentials
+    # Reject anything that isn't an ASCII bearer token shaped like a compact JWS
+    # (header.payload.sig) before hashing, base64-decoding, or verifying it.
+    if (
+        credentials.scheme.lower() != "bearer"
+        or not token.isascii()
+        or token.count(".") != 2
+        or not (20 <= len(token) <= 8192)
+    ):
+        raise _unauthorized()
+
+    key = hashlib.sha256(token.encode()).digest()
+    try:
+        with _CLAIMS_LOCK:
+            claims = _CLAIMS_CACHE[key]
+    except KeyError:
+        pass
+    else:
+        exp = claims.get("exp")
+        if exp is None or exp > time.time():
+            return copy.deepcopy(claims)
+
     try:
         claims = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALG])
-    except JWTError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired token",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    except InvalidTokenError:
+        raise _unauthorized()
+
+    exp = claims.get("exp")
+    if exp is None or exp > time.time():
+        with _CLAIMS_LOCK:
+            _CLAIMS_CACHE[key] = copy.deepcopy(claims)
     return claims
 
 
@@ -89,12 +161,18 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
-Instrumentator().instrument(app).expose(app)
+# Probe and scrape traffic is excluded so it doesn't pay for histogram updates
+Instrumentator(excluded_handlers=["/healthz", "/metrics"]).instrument(app).expose(app)
+
+
+# Probe responses never change, so the body is encoded once. A fresh Response
+# is still built per request since middleware may mutate its headers.
+_HEALTHZ_BODY = orjson.dumps({"status": "ok"})
 
 
 @app.get("/healthz", tags=["health"])
-def healthz():
-    return {"status": "ok"}
+async def healthz() -> Response:
+    return Response(_HEALTHZ_BODY, media_type="application/json")
 
 
 @app.get("/whoami", tags=["auth"])
@@ -107,4 +185,14 @@ if __name__ == "__main__":
 
     host = os.getenv("HOST", "0.0.0.0")
     port = int(os.getenv("PORT", "8000"))
-    uvicorn.run("server.main:app", host=host, port=port, reload=False)
+    # C event loop and HTTP parser; request metrics come from Prometheus, so the
+    # per-request access log is off
+    uvicorn.run(
+        "server.main:app",
+        host=host,
+        port=port,
+        reload=False,
+        loop="uvloop",
+        http="httptools",
+        access_log=False,
+    )
@@ -0,0 +1,10 @@
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture(scope="session")
+def client() -> TestClient:
+    """One TestClient for the whole session, so the app is wired up only once."""
+    from server.main import app
+
+    return TestClient(app)
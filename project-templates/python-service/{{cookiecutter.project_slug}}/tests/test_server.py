@@ -1,16 +1,48 @@
-from fastapi.testclient import TestClient
-from server.main import app
+import time
 
-client = TestClient(app)
+import jwt
 
 
-def test_healthz():
+def test_healthz(client):
     response = client.get("/healthz")
     assert response.status_code == 200
     assert response.json() == {"status": "ok"}
 
 
-def test_whoami_unauthorized():
+def test_whoami_unauthorized(client):
     response = client.get("/whoami")
-    # HTTPBearer returns 401 when no credentials provided
+    # HTTPBearer rejects missing credentials with 401 on current FastAPI and
+    # 403 on older releases still allowed by the fastapi>=0.100 pin
+    assert response.status_code in (401, 403)
+
+
+def test_whoami_authorized(client):
+    # Imported here so collecting this module doesn't import the app
+    from server.main import JWT_ALG, JWT_SECRET
+
+    token = jwt.encode({"sub": "alice", "exp": int(time.time()) + 60}, JWT_SECRET, JWT_ALG)
+    headers = {"Authorization": f"Bearer {token}"}
+    # Second request is served from the claims cache
+    for _ in range(2):
+        response = client.get("/whoami", headers=headers)
+        assert response.status_code == 200
+        assert response.json()["claims"]["sub"] == "alice"
+
+
+def test_whoami_malformed_token(client):
+    response = client.get("/whoami", headers={"Authorization": "Bearer not-a-jwt"})
     assert response.status_code == 401
+
+
+def test_cached_claims_are_not_shared():
+    from fastapi.security import HTTPAuthorizationCredentials
+    from server.main import JWT_ALG, JWT_SECRET, require_claims
+
+    token = jwt.encode({"sub": "bob", "roles": ["reader"]}, JWT_SECRET, JWT_ALG)
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    for _ in range(2):
+        claims = require_claims(credentials)
+        assert claims == {"sub": "bob", "roles": ["reader"]}
+        # A handler mutating its claims must not leak into the next request
+        claims["roles"].append("admin")
+        claims["sub"] = "mallory"
@@ -16,21 +16,34 @@ Usage:
     ./test-templates.py clean                 # Remove test output
 """
 
+import hashlib
+import http.client
+import io
 import os
 import shutil
 import subprocess
 import sys
+import threading
 import time
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import click
 
-# Colors
-GREEN = "\033[0;32m"
-RED = "\033[0;31m"
-BLUE = "\033[0;34m"
-YELLOW = "\033[0;33m"
-NC = "\033[0m"
+# Resolve stdout once; the log helpers write to it directly rather than
+# having click.echo look up the stream and its encoding on every line.
+_OUT = sys.stdout
+
+# Colors (click.echo would strip these when not on a terminal, so do it once here)
+if _OUT.isatty():
+    GREEN = "\033[0;32m"
+    RED = "\033[0;31m"
+    BLUE = "\033[0;34m"
+    YELLOW = "\033[0;33m"
+    NC = "\033[0m"
+else:
+    GREEN = RED = BLUE = YELLOW = NC = ""
 
 SCRIPT_DIR = Path(__file__).parent.resolve()
 OUTPUT_DIR = SCRIPT_DIR / "_test-output"
@@ -63,36 +76,56 @@ TEMPLATES = {
     },
 }
 
+# Commands shared by several validators
+MAKE_HELP = ("make", "help")
+MAKE_TEST = ("make", "test")
+MAKE_LINT = ("make", "lint")
+UV_SYNC = ("uv", "sync", "--all-extras")
+
+
+# While validators run concurrently, each worker thread collects its output in
+# its own buffer so every template's log is printed as one contiguous block.
+_local = threading.local()
+_echo_lock = threading.Lock()
+
+
+def echo(msg: str = "") -> None:
+    buf = getattr(_local, "buf", None)
+    if buf is None:
+        _OUT.write(f"{msg}\n")
+        # Flush so lines stay ordered with output from child processes
+        _OUT.flush()
+    else:
+        buf.write(f"{msg}\n")
+
 
 def log(msg: str) -> None:
-    click.echo(f"{BLUE}==>{NC} {msg}")
+    echo(f"{BLUE}==>{NC} {msg}")
 
 
 def success(msg: str) -> None:
-    click.echo(f"{GREEN}✓{NC} {msg}")
+    echo(f"{GREEN}✓{NC} {msg}")
 
 
 def error(msg: str) -> None:
-    click.echo(f"{RED}✗{NC} {msg}")
+    echo(f"{RED}✗{NC} {msg}")
 
 
 def warn(msg: str) -> None:
-    click.echo(f"{YELLOW}!{NC} {msg}")
+    echo(f"{YELLOW}!{NC} {msg}")
 
 
 def section(msg: str) -> None:
-    click.echo(f"\n{BLUE}━━━ {msg} ━━━{NC}")
+    echo(f"\n{BLUE}━━━ {msg} ━━━{NC}")
 
 
 def run(
-    cmd: str | list[str],
+    cmd: Sequence[str],
     cwd: Path | None = None,
     check: bool = True,
     capture: bool = False,
 ) -> subprocess.CompletedProcess:
     """Run a command and optionally check for errors."""
-    if isinstance(cmd, str):
-        cmd = cmd.split()
     log(f"{' '.join(cmd)}")
     result = subprocess.run(
         cmd,
@@ -102,18 +135,79 @@ def run(
     )
     if check and result.returncode != 0:
         if capture:
-            click.echo(result.stdout)
-            click.echo(result.stderr)
+            echo(result.stdout)
+            echo(result.stderr)
         raise click.ClickException(f"Command failed: {' '.join(cmd)}")
     return result
 
 
-def run_with_output(cmd: str | list[str], cwd: Path | None = None) -> None:
-    """Run a command and stream output."""
-    if isinstance(cmd, str):
-        cmd = cmd.split()
+def run_with_output(
+    cmd: Sequence[str],
+    cwd: Path | None = None,
+    env: dict[str, str] | None = None,
+) -> None:
+    """Run a command and stream output (into the thread's buffer, if any)."""
     log(f"{' '.join(cmd)}")
-    subprocess.run(cmd, cwd=cwd, check=True)
+    buf = getattr(_local, "buf", None)
+    if buf is None:
+        subprocess.run(cmd, cwd=cwd, env=env, check=True)
+        return
+    result = subprocess.run(
+        cmd,
+        cwd=cwd,
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+    )
+    buf.write(result.stdout)
+    if result.returncode != 0:
+        raise subprocess.CalledProcessError(result.returncode, cmd)
+
+
+def wait_ready(server: subprocess.Popen, port: int, timeout: float = 10.0) -> bool:
+    """Poll /healthz on localhost until it returns 200 or the timeout expires.
+
+    Gives up as soon as `server` exits, so a crash on startup fails fast and
+    another process holding the port can't pass the check for it.
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            return False
+        conn = http.client.HTTPConnection("localhost", port, timeout=0.2)
+        try:
+            conn.request("GET", "/healthz")
+            if conn.getresponse().status == 200:
+                # Only trust the answer if our server is still the one running
+                return server.poll() is None
+        except OSError:
+            pass
+        finally:
+            conn.close()
+        time.sleep(0.05)
+    return False
+
+
+def check_server(cmd: Sequence[str], cwd: Path, port: int) -> None:
+    """Start a server briefly and probe its /healthz in-process."""
+    log("Starting server briefly...")
+    server = subprocess.Popen(
+        cmd,
+        cwd=cwd,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        # Nothing here needs protecting from the child; skip closing every fd
+        close_fds=False,
+    )
+    try:
+        if wait_ready(server, port):
+            success("Server responds to /healthz")
+        else:
+            warn("Server health check failed")
+    finally:
+        server.terminate()
+        server.wait()
 
 
 # ============================================================================
@@ -121,11 +215,41 @@ def run_with_output(cmd: str | list[str], cwd: Path | None = None) -> None:
 # ============================================================================
 
 
+def template_hash(key: str) -> str:
+    """Hash a template's cookiecutter vars and the newest mtime of its files."""
+    tmpl = TEMPLATES[key]
+    template_dir = SCRIPT_DIR / tmpl["name"]
+    newest = max(p.stat().st_mtime_ns for p in template_dir.rglob("*"))
+    return hashlib.sha256(
+        repr(sorted(tmpl["vars"].items())).encode() + str(newest).encode()
+    ).hexdigest()
+
+
+def genhash_path(key: str) -> Path:
+    """Where the generation hash for a template lives (beside, not inside, its output)."""
+    return OUTPUT_DIR / f"{TEMPLATES[key]['output']}.genhash"
+
+
 def generate_template(key: str) -> Path:
-    """Generate a single template and return its output path."""
+    """Generate a single template and return its output path.
+
+    Output is reused when the template and its vars are unchanged. A reused
+    tree keeps whatever an earlier validate run left in it (.venv, uv.lock,
+    go.sum, bin/); a failed validation clears the hash so the next run
+    regenerates, and `clean` always forces a fresh tree.
+    """
     tmpl = TEMPLATES[key]
     template_dir = SCRIPT_DIR / tmpl["name"]
     output_path = OUTPUT_DIR / tmpl["output"]
+    hash_file = genhash_path(key)
+
+    # Reuse the previous output if neither the template nor its vars changed
+    digest = template_hash(key)
+    if output_path.exists() and hash_file.exists() and hash_file.read_text() == digest:
+        success(f"Up to date: {output_path}")
+        return output_path
+    if output_path.exists():
+        shutil.rmtree(output_path)
 
     log(f"Generating {tmpl['name']} template...")
 
@@ -135,6 +259,7 @@ def generate_template(key: str) -> Path:
         args.append(f"{k}={v}")
 
     subprocess.run(args, check=True, capture_output=True, text=True)
+    hash_file.write_text(digest)
     success(f"Generated: {output_path}")
     return output_path
 
@@ -148,21 +273,21 @@ def validate_go(project_dir: Path) -> None:
     """Validate go-service template."""
     section("Validating go-service")
 
-    run_with_output("make help", cwd=project_dir)
+    run_with_output(MAKE_HELP, cwd=project_dir)
     success("make help works")
 
-    run_with_output("go mod tidy", cwd=project_dir)
+    run_with_output(["go", "mod", "tidy"], cwd=project_dir)
     success("go mod tidy works")
 
-    run_with_output("make build", cwd=project_dir)
+    run_with_output(["make", "build"], cwd=project_dir)
     success("make build works")
 
-    run_with_output("./bin/test-go-service --help", cwd=project_dir)
+    run_with_output(["./bin/test-go-service", "--help"], cwd=project_dir)
     success("CLI --help works")
 
     # Tests may fail without database
     result = subprocess.run(
-        ["make", "test"], cwd=project_dir, capture_output=True, text=True
+        MAKE_TEST, cwd=project_dir, capture_output=True, text=True
     )
     if result.returncode == 0:
         success("make test works")
@@ -170,29 +295,11 @@ def validate_go(project_dir: Path) -> None:
         warn("make test failed (may need database)")
 
     # Brief server test
-    log("Starting server briefly...")
-    server = subprocess.Popen(
+    check_server(
         ["./bin/test-go-service", "server", "--addr", ":18080"],
         cwd=project_dir,
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.DEVNULL,
+        port=18080,
     )
-    time.sleep(1.5)
-    try:
-        result = subprocess.run(
-            ["curl", "-sf", "http://localhost:18080/healthz"],
-            capture_output=True,
-            timeout=5,
-        )
-        if result.returncode == 0:
-            success("Server responds to /healthz")
-        else:
-            warn("Server health check failed")
-    except Exception:
-        warn("Server health check failed")
-    finally:
-        server.terminate()
-        server.wait()
 
     success("go-service validation complete")
 
@@ -201,45 +308,27 @@ def validate_python_service(project_dir: Path) -> None:
     """Validate python-service template."""
     section("Validating python-service")
 
-    run_with_output("make help", cwd=project_dir)
+    run_with_output(MAKE_HELP, cwd=project_dir)
     success("make help works")
 
-    run_with_output(["uv", "sync", "--all-extras"], cwd=project_dir)
+    run_with_output(UV_SYNC, cwd=project_dir)
     success("uv sync --all-extras works")
 
     run_with_output(["uv", "run", "test-python-service", "--help"], cwd=project_dir)
     success("CLI --help works")
 
-    run_with_output("make test", cwd=project_dir)
+    run_with_output(MAKE_TEST, cwd=project_dir)
     success("make test works")
 
-    run_with_output("make lint", cwd=project_dir)
+    run_with_output(MAKE_LINT, cwd=project_dir)
     success("make lint works")
 
     # Brief server test
-    log("Starting server briefly...")
-    server = subprocess.Popen(
+    check_server(
         ["uv", "run", "uvicorn", "server.main:app", "--host", "0.0.0.0", "--port", "18000"],
         cwd=project_dir,
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.DEVNULL,
+        port=18000,
     )
-    time.sleep(2.5)
-    try:
-        result = subprocess.run(
-            ["curl", "-sf", "http://localhost:18000/healthz"],
-            capture_output=True,
-            timeout=5,
-        )
-        if result.returncode == 0:
-            success("Server responds to /healthz")
-        else:
-            warn("Server health check failed")
-    except Exception:
-        warn("Server health check failed")
-    finally:
-        server.terminate()
-        server.wait()
 
     success("python-service validation complete")
 
@@ -248,11 +337,11 @@ def validate_python_cli(project_dir: Path) -> None:
     """Validate python-cli template."""
     section("Validating python-cli")
 
-    run_with_output("make help", cwd=project_dir)
+    run_with_output(MAKE_HELP, cwd=project_dir)
     success("make help works")
 
     # Simple PEP 723 script
-    run_with_output("./simple.py --help", cwd=project_dir)
+    run_with_output(["./simple.py", "--help"], cwd=project_dir)
     success("simple.py --help works")
 
     run_with_output(["./simple.py", "hello", "--name", "World"], cwd=project_dir)
@@ -262,7 +351,7 @@ def validate_python_cli(project_dir: Path) -> None:
     success("simple.py add works")
 
     # Structured CLI
-    run_with_output(["uv", "sync", "--all-extras"], cwd=project_dir)
+    run_with_output(UV_SYNC, cwd=project_dir)
     success("uv sync --all-extras works")
 
     run_with_output(["uv", "run", "test-cli", "--help"], cwd=project_dir)
@@ -281,10 +370,10 @@ def validate_python_cli(project_dir: Path) -> None:
     )
     success("test-cli bar greet works")
 
-    run_with_output("make test", cwd=project_dir)
+    run_with_output(MAKE_TEST, cwd=project_dir)
     success("make test works")
 
-    run_with_output("make lint", cwd=project_dir)
+    run_with_output(MAKE_LINT, cwd=project_dir)
     success("make lint works")
 
     success("python-cli validation complete")
@@ -294,10 +383,10 @@ def validate_bayesian(project_dir: Path) -> None:
     """Validate python-bayesian-experiment template."""
     section("Validating python-bayesian-experiment")
 
-    run_with_output("make help", cwd=project_dir)
+    run_with_output(MAKE_HELP, cwd=project_dir)
     success("make help works")
 
-    run_with_output(["uv", "sync", "--all-extras"], cwd=project_dir)
+    run_with_output(UV_SYNC, cwd=project_dir)
     success("uv sync --all-extras works")
 
     run_with_output(["uv", "run", "test-bayesian", "--help"], cwd=project_dir)
@@ -306,36 +395,18 @@ def validate_bayesian(project_dir: Path) -> None:
     run_with_output(["uv", "run", "test-bayesian", "experiments", "--help"], cwd=project_dir)
     success("CLI experiments --help works")
 
-    run_with_output("make test", cwd=project_dir)
+    run_with_output(MAKE_TEST, cwd=project_dir)
     success("make test works")
 
-    run_with_output("make lint", cwd=project_dir)
+    run_with_output(MAKE_LINT, cwd=project_dir)
     success("make lint works")
 
     # Brief server test
-    log("Starting server briefly...")
-    server = subprocess.Popen(
+    check_server(
         ["uv", "run", "uvicorn", "test_bayesian.server.main:app", "--host", "0.0.0.0", "--port", "18001"],
         cwd=project_dir,
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.DEVNULL,
+        port=18001,
     )
-    time.sleep(3)
-    try:
-        result = subprocess.run(
-            ["curl", "-sf", "http://localhost:18001/healthz"],
-            capture_output=True,
-            timeout=5,
-        )
-        if result.returncode == 0:
-            success("Server responds to /healthz")
-        else:
-            warn("Server health check failed")
-    except Exception:
-        warn("Server health check failed")
-    finally:
-        server.terminate()
-        server.wait()
 
     success("python-bayesian-experiment validation complete")
 
@@ -344,10 +415,10 @@ def validate_ducklake(project_dir: Path) -> None:
     """Validate python-ducklake-service template."""
     section("Validating python-ducklake-service")
 
-    run_with_output("make help", cwd=project_dir)
+    run_with_output(MAKE_HELP, cwd=project_dir)
     success("make help works")
 
-    run_with_output(["uv", "sync", "--all-extras"], cwd=project_dir)
+    run_with_output(UV_SYNC, cwd=project_dir)
     success("uv sync --all-extras works")
 
     run_with_output(["uv", "run", "test-ducklake-service", "--help"], cwd=project_dir)
@@ -359,14 +430,13 @@ def validate_ducklake(project_dir: Path) -> None:
     run_with_output(["uv", "run", "test-ducklake-service", "migrate", "--help"], cwd=project_dir)
     success("CLI migrate --help works")
 
-    run_with_output("make lint", cwd=project_dir)
+    run_with_output(MAKE_LINT, cwd=project_dir)
     success("make lint works")
 
     # Tests need env vars but no running services
     env = os.environ.copy()
     env["SKIP_INTEGRATION"] = "1"
-    log("make test (SKIP_INTEGRATION=1)")
-    subprocess.run(["make", "test"], cwd=project_dir, check=True, env=env)
+    run_with_output(MAKE_TEST, cwd=project_dir, env=env)
     success("make test works")
 
     success("python-ducklake-service validation complete")
@@ -381,6 +451,27 @@ VALIDATORS = {
 }
 
 
+def run_validator(key: str, project_dir: Path) -> None:
+    """Run a validator, forgetting the generation hash if it fails."""
+    try:
+        VALIDATORS[key](project_dir)
+    except BaseException:
+        genhash_path(key).unlink(missing_ok=True)
+        raise
+
+
+def validate_buffered(key: str, project_dir: Path) -> None:
+    """Run a validator with its output buffered, then print it in one piece."""
+    _local.buf = io.StringIO()
+    try:
+        run_validator(key, project_dir)
+    finally:
+        with _echo_lock:
+            _OUT.write(_local.buf.getvalue())
+            _OUT.flush()
+        _local.buf = None
+
+
 # ============================================================================
 # CLI Commands
 # ============================================================================
@@ -425,9 +516,13 @@ def validate(only: str | None) -> None:
 
     click.echo()
 
-    # Then validate
-    for key in templates:
-        VALIDATORS[key](paths[key])
+    # Then validate. Validators are independent and spend their time waiting
+    # on subprocesses, so run them concurrently when there is more than one.
+    if len(templates) == 1:
+        run_validator(templates[0], paths[templates[0]])
+    else:
+        with ThreadPoolExecutor(max_workers=len(templates)) as pool:
+            list(pool.map(validate_buffered, templates, [paths[k] for k in templates]))
 
     if len(templates) > 1:
         section("All validations passed!")
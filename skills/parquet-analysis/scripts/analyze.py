@@ -11,11 +11,20 @@ This example demonstrates a complete data analysis workflow:
 6. Export results
 """
 
-import ibis
+import os
 from pathlib import Path
 
-# Connect to DuckDB (optimized for parquet)
-con = ibis.duckdb.connect()
+import ibis
+
+# Set EXPLORE=1 to include the interactive exploration steps (preview, summary
+# statistics, null counts). Each is an extra full scan, so batch and CI runs
+# skip them by default.
+EXPLORE = os.getenv("EXPLORE", "0") == "1"
+
+# Connect to DuckDB (optimized for parquet). Keyword arguments are DuckDB
+# settings; it already uses every core by default, so only let it reorder rows
+# for queries without an explicit ORDER BY so it can parallelize more freely.
+con = ibis.duckdb.connect(preserve_insertion_order=False)
 
 # ============================================================================
 # Step 1: Read and explore data
@@ -25,20 +34,32 @@ print("=" * 80)
 print("STEP 1: Load and explore data")
 print("=" * 80)
 
-# Read parquet file (replace with your actual file)
-sales = con.read_parquet("sales.parquet")
+# Columns used by the rest of the analysis. Selecting them up front lets
+# DuckDB push the projection into the parquet scan, so unused columns are
+# never read or decoded.
+NEEDED = ["sale_date", "quantity", "unit_price", "category", "customer_id", "order_id"]
+
+# Read parquet file (replace with your actual file) and materialize it as a
+# temp table. Every `.execute()` below would otherwise re-open the file and
+# re-parse its metadata; this way it is scanned and decoded exactly once.
+sales = con.create_table(
+    "sales",
+    con.read_parquet("sales.parquet").select(NEEDED),
+    temp=True,
+)
 
 # View schema
 print("\nSchema:")
 print(sales.schema())
 
-# Preview data
-print("\nFirst 10 rows:")
-print(sales.head(10).execute())
+if EXPLORE:
+    # Preview data
+    print("\nFirst 10 rows:")
+    print(sales.head(10).execute())
 
-# Basic statistics
-print("\nSummary statistics:")
-print(sales.describe().execute())
+    # Basic statistics
+    print("\nSummary statistics:")
+    print(sales.describe().execute())
 
 # ============================================================================
 # Step 2: Data quality checks
@@ -52,13 +73,16 @@ print("=" * 80)
 row_count = sales.count().execute()
 print(f"\nTotal rows: {row_count}")
 
-# Check for nulls
-print("\nNull counts by column:")
-null_counts = sales.select([
-    col.isnull().sum().name(f"{col}_nulls")
-    for col in sales.columns
-])
-print(null_counts.execute())
+if EXPLORE:
+    # Check for nulls: COUNT(*) - COUNT(col) for every column in one
+    # aggregation, so the table is scanned once and no per-row CASE expression
+    # is evaluated
+    print("\nNull counts by column:")
+    null_counts = sales.aggregate([
+        (sales.count() - sales[col].count()).name(f"{col}_nulls")
+        for col in sales.columns
+    ])
+    print(null_counts.execute())
 
 # Value counts for categorical column
 print("\nProduct category distribution:")
@@ -77,23 +101,27 @@ print("\n" + "=" * 80)
 print("STEP 3: Transform and enrich data")
 print("=" * 80)
 
-# Add computed columns
-enriched = sales.mutate(
-    # Extract date components
-    year=sales.sale_date.year(),
-    month=sales.sale_date.month(),
-    quarter=sales.sale_date.quarter(),
-
-    # Calculate revenue
-    revenue=sales.quantity * sales.unit_price,
-
-    # Categorize by size
-    order_size=ibis.case()
-        .when(sales.quantity < 10, "small")
-        .when(sales.quantity < 100, "medium")
-        .else_("large")
-        .end()
-)
+# Add computed columns (a function so filtered subsets can derive the same ones)
+def add_derived_columns(t):
+    return t.mutate(
+        # Extract date components
+        year=t.sale_date.year(),
+        month=t.sale_date.month(),
+        quarter=t.sale_date.quarter(),
+
+        # Calculate revenue
+        revenue=t.quantity * t.unit_price,
+
+        # Categorize by size
+        order_size=ibis.case()
+            .when(t.quantity < 10, "small")
+            .when(t.quantity < 100, "medium")
+            .else_("large")
+            .end()
+    )
+
+
+enriched = add_derived_columns(sales)
 
 print("\nEnriched data sample:")
 print(enriched.head(5).execute())
@@ -116,11 +144,21 @@ monthly_sales = (
         num_orders=enriched.count(),
         avg_order_value=enriched.revenue.mean()
     )
+    # Format the plot label in DuckDB rather than with pandas string ops
+    .mutate(
+        month_label=ibis._.year.cast("string")
+        + "-"
+        + ibis._.month.cast("string").lpad(2, "0")
+    )
     .order_by(["year", "month"])
 )
 
+# Execute each summary once and reuse the DataFrame for printing, export and
+# plotting; separate `.execute()` calls would each re-run the aggregation.
+monthly_df = monthly_sales.execute()
+
 print("\nMonthly sales:")
-print(monthly_sales.execute())
+print(monthly_df)
 
 # Category performance
 category_performance = (
@@ -134,8 +172,10 @@ category_performance = (
     .order_by(ibis.desc("total_revenue"))
 )
 
+category_df = category_performance.execute()
+
 print("\nCategory performance:")
-print(category_performance.execute())
+print(category_df)
 
 # ============================================================================
 # Step 5: Filtering
@@ -145,8 +185,16 @@ print("\n" + "=" * 80)
 print("STEP 5: Filtered analysis")
 print("=" * 80)
 
-# High value orders (revenue > $1000)
-high_value = enriched.filter(enriched.revenue > 1000)
+# High value orders (revenue > $1000). Filter on the raw columns before
+# deriving anything so the predicate is applied directly to the scan and
+# only matching rows pay for the computed columns. Materialize the result so
+# the count and the top-5 below read the filtered rows instead of each
+# re-applying the filter to the full table.
+high_value = con.create_table(
+    "high_value",
+    add_derived_columns(sales.filter(sales.quantity * sales.unit_price > 1000)),
+    temp=True,
+)
 
 print(f"\nHigh value orders: {high_value.count().execute()}")
 print("\nTop 5 high value orders:")
@@ -157,9 +205,14 @@ print(
     .execute()
 )
 
-# Recent sales (last 90 days from max date)
-max_date = sales.sale_date.max().execute()
-recent_cutoff = max_date - ibis.interval(days=90)
+# Recent sales (last 90 days from max date). The cutoff stays a scalar
+# subquery so DuckDB plans one query instead of a separate max() round-trip.
+# DuckDB types DATE - INTERVAL as a TIMESTAMP, which would make it cast every
+# sale_date; casting the cutoff back to DATE keeps the column compared bare.
+# (Ibis treats a plain .cast("date") as a no-op here, hence the round trip.)
+recent_cutoff = (
+    (sales.sale_date.max() - ibis.interval(days=90)).cast("timestamp").cast("date")
+)
 recent_sales = sales.filter(sales.sale_date >= recent_cutoff)
 
 print(f"\nRecent sales (last 90 days): {recent_sales.count().execute()}")
@@ -204,18 +257,27 @@ print("=" * 80)
 output_dir = Path("outputs")
 output_dir.mkdir(exist_ok=True)
 
-# Export enriched data to parquet
+# Export enriched data to parquet. On DuckDB, `to_parquet` compiles to a
+# native `COPY (...) TO` over the temp table (no second read of
+# sales.parquet); extra keyword arguments become COPY writer options.
+# ~100k-row row groups let chunked readers parallelize with bounded memory,
+# and ZSTD level 3 trades a little CPU for noticeably fewer bytes on disk.
 enriched_path = output_dir / "enriched_sales.parquet"
-con.to_parquet(enriched, str(enriched_path))
+con.to_parquet(
+    enriched,
+    str(enriched_path),
+    compression="zstd",
+    compression_level=3,
+    row_group_size=100_000,
+)
 print(f"\nEnriched data saved to: {enriched_path}")
 
-# Export monthly summary to parquet
+# Export monthly summary to parquet (already computed, so write the DataFrame)
 monthly_path = output_dir / "monthly_summary.parquet"
-con.to_parquet(monthly_sales, str(monthly_path))
+monthly_df.to_parquet(monthly_path, index=False)
 print(f"Monthly summary saved to: {monthly_path}")
 
 # Export category performance to CSV (via pandas)
-category_df = category_performance.execute()
 csv_path = output_dir / "category_performance.csv"
 category_df.to_csv(csv_path, index=False)
 print(f"Category performance saved to: {csv_path}")
@@ -232,9 +294,6 @@ try:
     import matplotlib.pyplot as plt
 
     # Monthly revenue trend
-    monthly_df = monthly_sales.execute()
-    monthly_df["month_label"] = monthly_df["year"].astype(str) + "-" + monthly_df["month"].astype(str).str.zfill(2)
-
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 5))
 
     # Revenue trend
@@ -245,7 +304,6 @@ try:
     ax1.tick_params(axis='x', rotation=45)
 
     # Category performance
-    category_df = category_performance.execute()
     ax2.barh(category_df["category"], category_df["total_revenue"])
     ax2.set_xlabel("Total Revenue")
     ax2.set_ylabel("Category")